@@ -15,7 +15,6 @@ from typing import Optional
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from data_processing.health_parser import AppleHealthParser
-from data_processing.health_exporter import HealthDataExporter
 from visualization.html_dashboard import generate_html_dashboard
 from utils.config_manager import load_config, save_config
 
@@ -45,11 +44,27 @@ def main() -> None:
     export_file = max(export_files, key=lambda x: x.stat().st_mtime)
     print(f"📁 Using health export: {export_file.name}")
     
+    # pandas-backed modules are imported only once there is an export to process,
+    # so the "no export found" paths above return without paying for them
+    from data_processing.health_exporter import HealthDataExporter
+    from data_processing.record_cache import RecordCache
+    
     try:
-        # Parse the health data
-        print("🔍 Parsing health data...")
-        parser = AppleHealthParser(export_file)
-        health_data = parser.parse()
+        # Parse the health data, reusing the cached parse of this export if present
+        data_config = config["data_processing"]
+        parser = AppleHealthParser(
+            export_file,
+            exclude_types=data_config["exclude_types"],
+            exclude_sources=data_config["exclude_sources"],
+        )
+        record_cache = RecordCache(Path("data/.cache"))
+        health_data = record_cache.load(parser)
+        if health_data is None:
+            print("🔍 Parsing health data...")
+            health_data = parser.parse()
+            record_cache.save(parser, health_data)
+        else:
+            print("⚡ Using cached health data (delete data/.cache to force a re-parse)")
         
         # Export structured JSON data files for the HTML dashboard
         output_dir = Path("output")
@@ -15,15 +15,16 @@ Output layout:
             └── {metric_id}.json     (daily/weekly/monthly agg per metric)
 """
 
-import json
 import re
-from datetime import datetime, date, timedelta
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, cast
 
+import numpy as np
 import pandas as pd
 
 from data_processing.health_parser import HealthRecord
+from utils import json_codec
 
 
 # ---------------------------------------------------------------------------
@@ -134,9 +135,11 @@ class HealthDataExporter:
 
         df = self._to_dataframe()
 
-        # Split into workouts and quantity/category records
-        workout_df = df[df["record_type"].str.startswith("Workout:")].copy()
-        metric_df  = df[~df["record_type"].str.startswith("Workout:")].copy()
+        # Split into workouts and quantity/category records. Both halves are
+        # only read from, so there is no need to copy them.
+        is_workout = df["record_type"].str.startswith("Workout:")
+        workout_df = df.loc[is_workout]
+        metric_df  = df.loc[~is_workout]
 
         metric_manifest_entries = self._export_metrics(metric_df)
         workout_summary = self._export_workouts(workout_df)
@@ -153,21 +156,25 @@ class HealthDataExporter:
 
     def _to_dataframe(self) -> pd.DataFrame:
         """Convert list of HealthRecord to a pandas DataFrame."""
-        rows = []
-        for r in self.records:
-            rows.append({
-                "record_type": r.record_type,
-                "source":      r.source,
-                "unit":        r.unit,
-                "value":       r.value,
-                "start_date":  r.start_date,
-                "end_date":    r.end_date,
-                "metadata":    r.metadata,
-            })
-        df = pd.DataFrame(rows)
+        # Build column-wise rather than one dict per record: far fewer
+        # allocations and pandas skips rescanning rows to discover columns.
+        # Type, source and unit repeat a handful of strings millions of times,
+        # so store them as categoricals (int codes + one lookup table).
+        records = self.records
+        df = pd.DataFrame({
+            "record_type": pd.Categorical([r.record_type for r in records]),
+            "source":      pd.Categorical([r.source      for r in records]),
+            "unit":        pd.Categorical([r.unit        for r in records]),
+            "value":       np.fromiter((r.value for r in records), dtype=np.float64, count=len(records)),
+            "start_date":  [r.start_date  for r in records],
+            "end_date":    [r.end_date    for r in records],
+            "metadata":    [r.metadata    for r in records],
+        })
         if not df.empty:
-            df["start_date"] = pd.to_datetime(df["start_date"])
-            df["date"] = df["start_date"].dt.date
+            df["start_date"] = pd.to_datetime(df["start_date"], cache=True)
+            # Floor to midnight in datetime64 rather than materialising a
+            # Python date object per row
+            df["date"] = df["start_date"].dt.normalize()
         return df
 
     # ------------------------------------------------------------------
@@ -181,7 +188,15 @@ class HealthDataExporter:
 
         manifest_entries = []
 
-        for apple_type, group in df.groupby("record_type"):
+        # Per-day stats for every metric in a single grouped pass, instead of
+        # one groupby per metric type
+        daily_stats = (
+            df.groupby(["record_type", "date"], observed=True)["value"]
+              .agg(["sum", "mean", "min", "max", "count"])
+        )
+
+        # observed=True: the categorical also holds the workout types split off in export()
+        for apple_type, group in df.groupby("record_type", observed=True):
             meta  = METRIC_META.get(apple_type, {})
             agg   = meta.get("agg", self._infer_agg(group))
             mid   = _metric_id(apple_type)
@@ -189,9 +204,13 @@ class HealthDataExporter:
             unit  = group["unit"].dropna().mode()
             unit  = unit.iloc[0] if not unit.empty else ""
 
-            daily   = self._aggregate_daily(group, agg)
-            weekly  = self._aggregate_weekly(daily, agg)
-            monthly = self._aggregate_monthly(daily, agg)
+            day_stats = cast(pd.DataFrame, daily_stats.xs(apple_type, level="record_type"))
+            daily   = self._aggregate_daily(day_stats, agg)
+            # Roll up the same rounded per-day values the daily view shows;
+            # Series.round() can resolve ties differently from round()
+            day_values = pd.Series([row["value"] for row in daily], index=day_stats.index)
+            weekly  = self._aggregate_weekly(day_values, agg)
+            monthly = self._aggregate_monthly(day_values, agg)
 
             payload = {
                 "metric_id":    mid,
@@ -239,86 +258,97 @@ class HealthDataExporter:
         return "mean"
 
     def _aggregate_daily(
-        self, group: pd.DataFrame, agg: str
+        self, day_stats: pd.DataFrame, agg: str
     ) -> List[Dict[str, Any]]:
-        """Aggregate records to one row per calendar day."""
-        g = group.groupby("date")["value"]
-        if agg == "sum":
-            agg_series = g.sum()
-        else:
-            agg_series = g.mean()
+        """Turn per-day sum/mean/min/max/count stats into one row per calendar day."""
+        agg_series   = day_stats["sum"] if agg == "sum" else day_stats["mean"]
+        min_series   = day_stats["min"]
+        max_series   = day_stats["max"]
+        count_series = day_stats["count"]
 
-        min_series   = g.min()
-        max_series   = g.max()
-        count_series = g.count()
+        # groupby returns the days sorted; format all date labels in one pass
+        labels = pd.DatetimeIndex(agg_series.index).strftime("%Y-%m-%d")
 
         result = []
-        for d in sorted(agg_series.index):
+        for d, value, lo, hi, count in zip(
+            labels,
+            agg_series.to_numpy(),
+            min_series.to_numpy(),
+            max_series.to_numpy(),
+            count_series.to_numpy(),
+        ):
             result.append({
-                "date":  str(d),
-                "value": round(float(agg_series[d]), 4),
-                "min":   round(float(min_series[d]),   4),
-                "max":   round(float(max_series[d]),   4),
-                "count": int(count_series[d]),
+                "date":  d,
+                "value": round(float(value), 4),
+                "min":   round(float(lo),    4),
+                "max":   round(float(hi),    4),
+                "count": int(count),
             })
         return result
 
     def _aggregate_weekly(
-        self, daily: List[Dict[str, Any]], agg: str
+        self, day_values: pd.Series, agg: str
     ) -> List[Dict[str, Any]]:
-        """Roll up daily rows into ISO week buckets."""
-        if not daily:
+        """Roll up per-day values into ISO week buckets."""
+        if day_values.empty:
             return []
 
-        week_map: Dict[str, List[float]] = {}
-        week_start: Dict[str, str] = {}
+        days = pd.DatetimeIndex(day_values.index)
+        # Monday of each day's week, computed in datetime64 arithmetic
+        week_starts = days - pd.to_timedelta(days.weekday, unit="D")
+        values, counts = self._rollup(day_values, week_starts, agg)
 
-        for row in daily:
-            d = date.fromisoformat(row["date"])
-            iso_year, iso_week, _ = d.isocalendar()
-            key = f"{iso_year}-W{iso_week:02d}"
-            week_map.setdefault(key, []).append(row["value"])
-            # Track the Monday of that week
-            monday = d - timedelta(days=d.weekday())
-            week_start.setdefault(key, str(monday))
+        # The Monday's ISO year/week is the week's ISO year/week
+        weeks = pd.DatetimeIndex(values.index)
+        iso = weeks.isocalendar()
+        keys = [f"{y}-W{w:02d}" for y, w in zip(iso["year"], iso["week"])]
 
         result = []
-        for key in sorted(week_map.keys()):
-            vals = week_map[key]
-            value = sum(vals) if agg == "sum" else sum(vals) / len(vals)
+        for key, start, value, count in zip(
+            keys, weeks.strftime("%Y-%m-%d"), values.to_numpy(), counts.to_numpy()
+        ):
             result.append({
                 "week":       key,
-                "start_date": week_start[key],
-                "value":      round(value, 4),
-                "count":      len(vals),
+                "start_date": start,
+                "value":      round(float(value), 4),
+                "count":      int(count),
             })
         return result
 
     def _aggregate_monthly(
-        self, daily: List[Dict[str, Any]], agg: str
+        self, day_values: pd.Series, agg: str
     ) -> List[Dict[str, Any]]:
-        """Roll up daily rows into calendar-month buckets."""
-        if not daily:
+        """Roll up per-day values into calendar-month buckets."""
+        if day_values.empty:
             return []
 
-        month_map: Dict[str, List[float]] = {}
-
-        for row in daily:
-            key = row["date"][:7]  # "YYYY-MM"
-            month_map.setdefault(key, []).append(row["value"])
+        days = pd.DatetimeIndex(day_values.index)
+        # First of each day's month, in pandas arithmetic so a timezone-aware
+        # index keeps its local calendar days
+        month_starts = days - pd.to_timedelta(days.day - 1, unit="D")
+        values, counts = self._rollup(day_values, month_starts, agg)
 
         result = []
-        for key in sorted(month_map.keys()):
-            vals = month_map[key]
-            value = sum(vals) if agg == "sum" else sum(vals) / len(vals)
+        for start, value, count in zip(
+            pd.DatetimeIndex(values.index).strftime("%Y-%m-%d"), values.to_numpy(), counts.to_numpy()
+        ):
             result.append({
-                "month":      key,
-                "start_date": key + "-01",
-                "value":      round(value, 4),
-                "count":      len(vals),
+                "month":      start[:7],  # "YYYY-MM"
+                "start_date": start,
+                "value":      round(float(value), 4),
+                "count":      int(count),
             })
         return result
 
+    @staticmethod
+    def _rollup(
+        day_values: pd.Series, bucket_starts: pd.DatetimeIndex, agg: str
+    ) -> Tuple[pd.Series, pd.Series]:
+        """Sum or average per-day values into buckets; return (values, day counts)."""
+        g = day_values.groupby(bucket_starts)
+        values = g.sum() if agg == "sum" else g.mean()
+        return values, g.count()
+
     # ------------------------------------------------------------------
     # Workout export
     # ------------------------------------------------------------------
@@ -328,13 +358,16 @@ class HealthDataExporter:
         if df.empty:
             return {"total": 0, "types": [], "date_range": {"start": None, "end": None}}
 
+        df = df.sort_values("start_date")
+        df["date_label"] = df["date"].dt.strftime("%Y-%m-%d")
+
         records_out = []
-        for _, row in df.sort_values("start_date").iterrows():
+        for _, row in df.iterrows():
             meta         = row.get("metadata") or {}
             apple_type   = meta.get("workout_type", row["record_type"].replace("Workout:", ""))
             display_type = _workout_display_name(apple_type)
             records_out.append({
-                "date":             str(row["date"]),
+                "date":             row["date_label"],
                 "type":             display_type,
                 "apple_type":       apple_type,
                 "duration_minutes": round(float(row["value"]), 2),
@@ -412,8 +445,7 @@ class HealthDataExporter:
 
     @staticmethod
     def _write_json(path: Path, data: Any) -> None:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, separators=(",", ":"), default=str)
+        path.write_bytes(json_codec.dumps(data))
 
 
 def _safe_float(value: Any) -> Optional[float]:
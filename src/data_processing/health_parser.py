@@ -5,15 +5,34 @@ Apple Health Data Parser
 Parses Apple Health export .zip files and extracts health data into structured format.
 """
 
+import math
+import re
+import sys
 import zipfile
-import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import IO, Dict, Iterable, Iterator, List, Any, Optional
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 import json
-import tempfile
-import shutil
+
+# lxml is considerably faster on large exports; fall back to the stdlib parser
+try:
+    from lxml import etree as ET  # type: ignore[import-untyped]
+    HAS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAS_LXML = False
+
+# Elements that carry health data
+HEALTH_ELEMENT_TAGS = ('Record', 'Workout')
+
+# Record children holding fields of the record itself rather than metadata
+RECORD_FIELD_TAGS = frozenset(('Value', 'StartDate', 'EndDate'))
+
+# The health data lives in apple_health_export/export.xml; export_cda.xml and
+# friends sit next to it and must not match
+EXPORT_XML_PATTERN = re.compile(r'(?:^|/)export\.xml$', re.IGNORECASE)
 
 @dataclass
 class HealthRecord:
@@ -29,114 +48,134 @@ class HealthRecord:
 class AppleHealthParser:
     """Parser for Apple Health export files."""
     
-    def __init__(self, zip_file_path: Path):
+    def __init__(
+        self,
+        zip_file_path: Path,
+        exclude_types: Optional[Iterable[str]] = None,
+        exclude_sources: Optional[Iterable[str]] = None
+    ):
+        """Initialize the parser for an export zip, with optional exclusions.
+
+        exclude_types matches a Record's `type` or a Workout's `workoutActivityType`;
+        exclude_sources matches `sourceName`. Excluded elements are skipped before
+        their other attributes are parsed.
+        """
         self.zip_file_path = zip_file_path
-        self.temp_dir = None
+        self.exclude_types = frozenset(exclude_types or ())
+        self.exclude_sources = frozenset(exclude_sources or ())
         
     def parse(self) -> List[HealthRecord]:
         """Parse the Apple Health export file and return structured health data."""
         if not self.zip_file_path.exists():
             raise FileNotFoundError(f"Health export file not found: {self.zip_file_path}")
         
-        # Extract the zip file to a temporary directory
-        self.temp_dir = tempfile.mkdtemp()
-        
-        try:
-            with zipfile.ZipFile(self.zip_file_path, 'r') as zip_ref:
-                zip_ref.extractall(self.temp_dir)
-            
+        with zipfile.ZipFile(self.zip_file_path, 'r') as zip_ref:
             # Find the main export.xml file
-            xml_file = None
-            for file in Path(self.temp_dir).rglob('*.xml'):
-                if 'export' in file.name.lower():
-                    xml_file = file
-                    break
+            xml_name = next(
+                (name for name in zip_ref.namelist() if EXPORT_XML_PATTERN.search(name)),
+                None
+            )
             
-            if not xml_file:
+            if not xml_name:
                 raise FileNotFoundError("Could not find export.xml in the health data archive")
             
-            return self._parse_xml(xml_file)
-            
-        finally:
-            # Clean up temporary directory
-            if self.temp_dir and Path(self.temp_dir).exists():
-                shutil.rmtree(self.temp_dir)
+            # Decompress straight into the parser rather than extracting to disk
+            with zip_ref.open(xml_name) as xml_file:
+                return self._parse_xml(xml_file)
     
-    def _parse_xml(self, xml_file: Path) -> List[HealthRecord]:
+    def _parse_xml(self, xml_file: IO[bytes]) -> List[HealthRecord]:
         """Parse the Apple Health XML export file."""
         records = []
         
         try:
-            # Parse the XML file
-            tree = ET.parse(xml_file)
-            root = tree.getroot()
-            
-            # Find all Record elements - handle both direct children and nested records
-            for record_elem in root.findall('.//Record'):
-                record = self._parse_record_element(record_elem)
+            for elem in self._iter_health_elements(xml_file):
+                if elem.tag == 'Record':
+                    record = self._parse_record_element(elem)
+                else:
+                    # Workout elements contain valuable workout data
+                    record = self._parse_workout_element(elem)
+                
                 if record:
                     records.append(record)
             
-            # Also look for Workout elements which contain valuable workout data
-            for workout_elem in root.findall('.//Workout'):
-                workout_record = self._parse_workout_element(workout_elem)
-                if workout_record:
-                    records.append(workout_record)
-            
             return records
             
         except ET.ParseError as e:
             raise ValueError(f"Error parsing XML file: {e}")
     
+    def _iter_health_elements(self, xml_file: IO[bytes]) -> Iterator[Any]:
+        """
+        Stream Record and Workout elements from the XML without building the full DOM.
+        
+        Each element is released once the caller has processed it, so memory stays
+        bounded regardless of export size.
+        """
+        if HAS_LXML:
+            # libxml2 filters on tag name in C, so other elements are never yielded
+            context = ET.iterparse(xml_file, events=('end',), tag=HEALTH_ELEMENT_TAGS)
+            for _, elem in context:
+                yield elem
+                elem.clear(keep_tail=True)
+                # lxml keeps processed siblings attached to the parent; drop them
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+        else:
+            # The stdlib parser also keeps processed siblings attached to the root,
+            # so grab it from the first 'start' event and clear it as we go
+            context = ET.iterparse(xml_file, events=('start', 'end'))
+            _, root = next(context)
+            for event, elem in context:
+                if event == 'end' and elem.tag in HEALTH_ELEMENT_TAGS:
+                    yield elem
+                    # Records nested in a Correlation are still reported
+                    # before their parent closes
+                    root.clear()
+    
+    # Parsed records are cached across runs: any change to what the _parse_*
+    # methods return must bump CACHE_VERSION in record_cache.py
+
     def _parse_record_element(self, record_elem) -> Optional[HealthRecord]:
         """Parse a single Record element from the XML."""
         try:
             record_type = record_elem.get('type')
+            if record_type is None:
+                return None
             source = record_elem.get('sourceName', 'Unknown')
-            unit = record_elem.get('unit')
-            
-            # Parse value - try both attribute and child element
-            value = None
-            value_elem = record_elem.find('Value')
-            if value_elem is not None:
-                value = float(value_elem.text)
-            else:
-                # Try to get value from attribute
-                value_text = record_elem.get('value')
-                if value_text:
-                    value = float(value_text)
-                else:
-                    return None
-            
-            # Parse dates - try both attributes and child elements
-            start_date = None
-            end_date = None
-            
-            # Try child elements first
-            start_date_elem = record_elem.find('StartDate')
-            end_date_elem = record_elem.find('EndDate')
-            
-            if start_date_elem is not None:
-                start_date = self._parse_apple_date(start_date_elem.text)
-                if end_date_elem is not None:
-                    end_date = self._parse_apple_date(end_date_elem.text)
-            else:
-                # Try attributes
-                start_date_text = record_elem.get('startDate')
-                end_date_text = record_elem.get('endDate')
-                
-                if start_date_text:
-                    start_date = self._parse_apple_date(start_date_text)
-                    if end_date_text:
-                        end_date = self._parse_apple_date(end_date_text)
-                else:
-                    return None
+            if record_type in self.exclude_types or source in self.exclude_sources:
+                return None
+            unit = _intern(record_elem.get('unit'))
             
-            # Extract metadata from child elements
+            # Apple Health stores the value and dates as attributes; child
+            # elements are only consulted when an attribute is missing
+            value_text = record_elem.get('value')
+            if value_text is None and len(record_elem):
+                value_elem = record_elem.find('Value')
+                if value_elem is not None:
+                    value_text = value_elem.text
+            value = _parse_numeric(value_text)
+            if value is None:
+                return None
+            
+            start_date_text = record_elem.get('startDate')
+            end_date_text = record_elem.get('endDate')
+            if start_date_text is None and len(record_elem):
+                start_date_elem = record_elem.find('StartDate')
+                if start_date_elem is not None:
+                    start_date_text = start_date_elem.text
+                    end_date_elem = record_elem.find('EndDate')
+                    end_date_text = end_date_elem.text if end_date_elem is not None else None
+            
+            if not start_date_text:
+                return None
+            start_date = self._parse_apple_date(start_date_text)
+            end_date = self._parse_apple_date(end_date_text) if end_date_text else None
+            
+            # Extract metadata from child elements; most records have none
             metadata = {}
-            for child in record_elem:
-                if child.tag not in ['Value', 'StartDate', 'EndDate']:
-                    metadata[child.tag] = child.text
+            if len(record_elem):
+                for child in record_elem:
+                    if child.tag not in RECORD_FIELD_TAGS:
+                        metadata[child.tag] = child.text
             
             # Add source version to metadata if available
             source_version = record_elem.get('sourceVersion')
@@ -149,8 +188,8 @@ class AppleHealthParser:
                 metadata['device'] = device
             
             return HealthRecord(
-                record_type=record_type,
-                source=source,
+                record_type=sys.intern(record_type),
+                source=sys.intern(source),
                 unit=unit,
                 value=value,
                 start_date=start_date,
@@ -158,7 +197,7 @@ class AppleHealthParser:
                 metadata=metadata
             )
             
-        except (ValueError, AttributeError) as e:
+        except (ValueError, AttributeError):
             # Skip malformed records
             return None
     
@@ -167,6 +206,8 @@ class AppleHealthParser:
         try:
             workout_type = workout_elem.get('workoutActivityType', 'UnknownWorkout')
             source = workout_elem.get('sourceName', 'Unknown')
+            if workout_type in self.exclude_types or source in self.exclude_sources:
+                return None
             
             # Get duration
             duration = float(workout_elem.get('duration', '0'))
@@ -187,26 +228,62 @@ class AppleHealthParser:
             }
             
             return HealthRecord(
-                record_type=f"Workout:{workout_type}",
-                source=source,
-                unit=workout_elem.get('durationUnit', 'min'),
+                record_type=sys.intern(f"Workout:{workout_type}"),
+                source=sys.intern(source),
+                unit=sys.intern(workout_elem.get('durationUnit', 'min')),
                 value=duration,
                 start_date=start_date,
                 end_date=end_date,
                 metadata=metadata
             )
             
-        except (ValueError, AttributeError) as e:
+        except (ValueError, AttributeError):
             # Skip malformed workout records
             return None
     
     def _parse_apple_date(self, date_str: str) -> datetime:
         """Parse Apple's date format into datetime object."""
-        # Apple uses ISO 8601 format: YYYY-MM-DD HH:MM:SS ±HH:MM
-        try:
-            # Remove timezone info for simplicity (we'll handle it properly later)
-            clean_date = date_str.split(' ')[0] + ' ' + date_str.split(' ')[1]
-            return datetime.strptime(clean_date, '%Y-%m-%d %H:%M:%S')
-        except ValueError:
-            # Fallback to more robust parsing
-            return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
\ No newline at end of file
+        if not date_str:
+            raise ValueError("Missing date")
+        return _parse_date_text(date_str)
+
+
+# Every record repeats its type, source and unit, and the XML parsers return a
+# fresh string for each attribute read; interning shares one copy per value
+# across the whole export
+def _intern(text: Optional[str]) -> Optional[str]:
+    """sys.intern() an attribute value that may be missing."""
+    return sys.intern(text) if text is not None else None
+
+
+# Characters a numeric value can start with. Category records (sleep, stand
+# hours, ...) carry enum strings such as 'HKCategoryValueSleepAnalysisAsleep'
+# and are rejected here without raising.
+_NUMERIC_START = frozenset('0123456789+-.')
+
+def _parse_numeric(text: Optional[str]) -> Optional[float]:
+    """Convert a value string to float, returning None if it is missing, not numeric or not finite."""
+    if not text:
+        return None
+    text = text.strip()
+    if not text or text[0] not in _NUMERIC_START:
+        return None
+    try:
+        value = float(text)
+    except ValueError:
+        return None
+    return value if math.isfinite(value) else None
+
+
+# Samples taken at the same instant share timestamps across metrics, and a
+# record's start and end date are often equal, so repeats are common
+@lru_cache(maxsize=65536)
+def _parse_date_text(date_str: str) -> datetime:
+    """Convert an Apple date string to a naive datetime."""
+    # Apple uses 'YYYY-MM-DD HH:MM:SS ±HHMM'; the first 19 characters are the
+    # local time, and the offset is dropped for simplicity
+    if date_str[10:11] == ' ':
+        return datetime.fromisoformat(date_str[:19])
+    # Fallback to more robust parsing, keeping the local time and dropping the
+    # offset as above so every parsed date is naive
+    return datetime.fromisoformat(date_str.replace('Z', '+00:00')).replace(tzinfo=None)
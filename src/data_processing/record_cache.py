@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Parsed Record Cache
+
+Persists the records parsed from an Apple Health export as a Parquet file so
+repeated runs on the same export skip XML parsing entirely.
+
+Cache layout:
+    data/.cache/
+    └── {export_stem}.{key}.parquet   (key = cache version + export size/mtime + parser exclusions)
+"""
+
+import contextlib
+import glob
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, List, Optional
+
+import pandas as pd
+
+from data_processing.health_parser import AppleHealthParser, HealthRecord
+from utils import json_codec
+
+# Part of every cache key: bump whenever AppleHealthParser's _parse_* semantics
+# or the cached columns change, so caches written by older code are not reused
+CACHE_VERSION = 4
+
+# Hex digits of the key digest used in cache file names
+_KEY_LENGTH = 12
+
+
+class RecordCache:
+    """Parquet cache of parsed HealthRecords, one file per export zip."""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def load(self, parser: AppleHealthParser) -> Optional[List[HealthRecord]]:
+        """Return the cached records for this parser's export, or None on a miss."""
+        path = self._cache_path(parser)
+        if not path.exists():
+            return None
+
+        try:
+            df = pd.read_parquet(path)
+        except (ImportError, OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable record cache {path.name}: {e}")
+            return None
+
+        metadata = [json_codec.loads(m) for m in df["metadata"]]
+        return [
+            HealthRecord(
+                record_type=record_type,
+                source=source,
+                unit=unit,
+                value=value,
+                start_date=start_date,
+                end_date=end_date,
+                metadata=meta,
+            )
+            for record_type, source, unit, value, start_date, end_date, meta in zip(
+                df["record_type"].tolist(),
+                df["source"].tolist(),
+                _nullable_list(df["unit"]),
+                df["value"].tolist(),
+                df["start_date"].tolist(),
+                _nullable_list(df["end_date"]),
+                metadata,
+            )
+        ]
+
+    def save(self, parser: AppleHealthParser, records: List[HealthRecord]) -> None:
+        """Write records to the cache, replacing older caches of the same export."""
+        df = pd.DataFrame({
+            "record_type": pd.Categorical([r.record_type for r in records]),
+            "source":      pd.Categorical([r.source      for r in records]),
+            "unit":        pd.Categorical([r.unit        for r in records]),
+            "value":       [r.value      for r in records],
+            "start_date":  pd.to_datetime([r.start_date for r in records]),
+            "end_date":    pd.to_datetime([r.end_date   for r in records]),
+            "metadata":    [json_codec.dumps(r.metadata).decode("utf-8") for r in records],
+        })
+
+        path = self._cache_path(parser)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(tmp_path, compression="zstd", index=False)
+            tmp_path.replace(path)
+        except ImportError:
+            print("⚠️ Parquet support not installed (pip install pyarrow); record cache disabled")
+            return
+        except (OSError, ValueError) as e:
+            # The cache only saves time on the next run; don't fail this one over it
+            print(f"⚠️ Could not write record cache {path.name}: {e}")
+            with contextlib.suppress(OSError):
+                tmp_path.unlink()
+            return
+
+        # Drop caches of earlier versions of the same export. Match the exact
+        # name shape, so 'export.zip' leaves the cache of 'export.old.zip' alone
+        own_caches = (
+            glob.escape(parser.zip_file_path.stem) + "." + "[0-9a-f]" * _KEY_LENGTH + ".parquet"
+        )
+        for stale in self.cache_dir.glob(own_caches):
+            if stale != path:
+                with contextlib.suppress(OSError):
+                    stale.unlink()
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _cache_path(self, parser: AppleHealthParser) -> Path:
+        """Cache file for the parser's export; changes with the export, exclusions or CACHE_VERSION."""
+        stat = parser.zip_file_path.stat()
+        key = json.dumps([
+            CACHE_VERSION,
+            stat.st_size,
+            stat.st_mtime_ns,
+            sorted(parser.exclude_types),
+            sorted(parser.exclude_sources),
+        ])
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:_KEY_LENGTH]
+        return self.cache_dir / f"{parser.zip_file_path.stem}.{digest}.parquet"
+
+
+def _nullable_list(series: pd.Series) -> List[Any]:
+    """Series values as a list, with NaN/NaT mapped back to None."""
+    return [None if pd.isna(v) else v for v in series.tolist()]
@@ -37,10 +37,9 @@ def load_config() -> Dict[str, Any]:
     # Try to load existing config
     try:
         if config_file.exists():
-            with open(config_file, 'r') as f:
-                user_config = json.load(f)
-                # Merge user config with defaults (user config takes precedence)
-                return _deep_merge(default_config, user_config)
+            user_config = json.loads(config_file.read_bytes())
+            # Merge user config with defaults (user config takes precedence)
+            return _deep_merge(default_config, user_config)
         return default_config
     except (json.JSONDecodeError, IOError) as e:
         print(f"⚠️ Error loading config file: {e}")
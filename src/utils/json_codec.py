@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+JSON Codec for Apple Health Dashboard
+
+Encodes and decodes JSON with orjson when it is installed, falling back to the
+stdlib json module. Both backends produce the same document: numpy scalars and
+arrays become numbers and lists, NaN/Infinity become null (JSON.parse rejects
+the bare tokens), and datetimes and other unknown types are written via str().
+"""
+
+import json
+import math
+from typing import Any, Union
+
+import numpy as np
+
+# orjson encodes and decodes several times faster; fall back to the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+def dumps(data: Any) -> bytes:
+    """Serialize data to compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(
+            data,
+            default=str,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME,
+        )
+    return json.dumps(
+        _to_json_types(data), separators=(",", ":"), ensure_ascii=False, default=str
+    ).encode("utf-8")
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON document from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _to_json_types(data: Any) -> Any:
+    """Convert what orjson handles natively (numpy values, non-finite floats) for the stdlib encoder."""
+    if isinstance(data, float):
+        return float(data) if math.isfinite(data) else None
+    if isinstance(data, dict):
+        return {key: _to_json_types(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [_to_json_types(value) for value in data]
+    if isinstance(data, (np.generic, np.ndarray)):
+        return _to_json_types(data.tolist())
+    return data
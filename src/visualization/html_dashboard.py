@@ -735,19 +735,19 @@ function applyWorkoutFilter() {
     subtitle.textContent = `${records.length.toLocaleString()} workouts · ${typeCount} type(s)`;
   }
 
-  // Summary cards with color accent
-  const grid = document.getElementById('wk-summary-grid');
-  grid.innerHTML = '';
-  for (const [type, s] of Object.entries(byType)) {
-    if (!s) continue;
-    const color = state.workoutTypeColors[type] || '#8e8e93';
-    grid.innerHTML += `
+  // Summary cards with color accent – built as one string so the grid is
+  // parsed once instead of re-serialised and re-parsed per card
+  document.getElementById('wk-summary-grid').innerHTML = Object.entries(byType)
+    .filter(([, s]) => s)
+    .map(([type, s]) => {
+      const color = state.workoutTypeColors[type] || '#8e8e93';
+      return `
       <div class="stat-card" style="border-left: 4px solid ${color}">
         <div class="label">${type}</div>
         <div class="value">${s.count}</div>
         <div class="unit">${s.avg_duration_minutes} min avg · ${Math.round(s.total_duration_minutes / 60)}h total</div>
       </div>`;
-  }
+    }).join('');
 
   // Calendar
   disposeAllCharts();
@@ -794,6 +794,14 @@ function renderWorkoutCalendar(records, years, containerH) {
     return { value: [date, count], itemStyle: { color: hexAlpha(baseColor, alpha) } };
   });
 
+  // Bucket days by year in one pass rather than re-scanning calData per calendar
+  const calDataByYear = {};
+  for (const d of calData) {
+    const year = d.value[0].slice(0, 4);
+    if (!calDataByYear[year]) calDataByYear[year] = [];
+    calDataByYear[year].push(d);
+  }
+
   // One calendar component per year, stacked vertically
   const PER_YEAR_H  = 150;
   const TOP_PADDING = 30;
@@ -818,7 +826,7 @@ function renderWorkoutCalendar(records, years, containerH) {
     type: 'heatmap',
     coordinateSystem: 'calendar',
     calendarIndex: i,
-    data: calData.filter(d => d.value[0].startsWith(year)),
+    data: calDataByYear[year] || [],
   }));
 
   chart.setOption({
@@ -0,0 +1,111 @@
+"""Tests for the per-metric JSON export."""
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from data_processing.health_exporter import HealthDataExporter
+from data_processing.health_parser import HealthRecord
+
+
+def _record(record_type: str, unit: str, value: float, start: str) -> HealthRecord:
+    return HealthRecord(
+        record_type=record_type,
+        source="iPhone",
+        unit=unit,
+        value=value,
+        start_date=datetime.fromisoformat(start),
+        end_date=None,
+        metadata={},
+    )
+
+
+def _steps(value: float, start: str) -> HealthRecord:
+    return _record("HKQuantityTypeIdentifierStepCount", "count", value, start)
+
+
+def _heart_rate(value: float, start: str) -> HealthRecord:
+    return _record("HKQuantityTypeIdentifierHeartRate", "count/min", value, start)
+
+
+def _body_mass(value: float, start: str) -> HealthRecord:
+    return _record("HKQuantityTypeIdentifierBodyMass", "kg", value, start)
+
+
+@pytest.fixture
+def metrics(tmp_path) -> Dict[str, Dict[str, Any]]:
+    records: List[HealthRecord] = [
+        # Steps are summed. 2024-01-29 is a Monday; 2024-02-01 closes ISO week
+        # 5 but opens February.
+        _steps(100, "2024-01-29 08:00:00"),
+        _steps(50,  "2024-01-29 18:00:00"),
+        _steps(200, "2024-01-31 12:00:00"),
+        _steps(300, "2024-02-01 00:30:00"),
+        _steps(400, "2024-02-05 09:00:00"),
+        # Heart rate is averaged per day, then across days
+        _heart_rate(60, "2024-01-29 08:00:00"),
+        _heart_rate(70, "2024-01-29 09:00:00"),
+        _heart_rate(80, "2024-01-30 10:00:00"),
+        # The day's mean is exactly 116.06725; the weekly and monthly rows
+        # must roll up the same rounded value the daily row shows
+        _body_mass(116.0672, "2024-01-29 07:00:00"),
+        _body_mass(116.0673, "2024-01-29 07:05:00"),
+    ]
+    HealthDataExporter(records, tmp_path).export()
+
+    metrics_dir = tmp_path / "data" / "metrics"
+    return {
+        path.stem: json.loads(path.read_text(encoding="utf-8"))
+        for path in metrics_dir.glob("*.json")
+    }
+
+
+def test_summed_metric_rollups(metrics):
+    steps = metrics["step_count"]
+
+    assert steps["agg_method"] == "sum"
+    assert steps["daily"] == [
+        {"date": "2024-01-29", "value": 150.0, "min": 50.0,  "max": 100.0, "count": 2},
+        {"date": "2024-01-31", "value": 200.0, "min": 200.0, "max": 200.0, "count": 1},
+        {"date": "2024-02-01", "value": 300.0, "min": 300.0, "max": 300.0, "count": 1},
+        {"date": "2024-02-05", "value": 400.0, "min": 400.0, "max": 400.0, "count": 1},
+    ]
+    assert steps["weekly"] == [
+        {"week": "2024-W05", "start_date": "2024-01-29", "value": 650.0, "count": 3},
+        {"week": "2024-W06", "start_date": "2024-02-05", "value": 400.0, "count": 1},
+    ]
+    assert steps["monthly"] == [
+        {"month": "2024-01", "start_date": "2024-01-01", "value": 350.0, "count": 2},
+        {"month": "2024-02", "start_date": "2024-02-01", "value": 700.0, "count": 2},
+    ]
+
+
+def test_averaged_metric_rollups(metrics):
+    heart_rate = metrics["heart_rate"]
+
+    assert heart_rate["agg_method"] == "mean"
+    assert [(d["date"], d["value"]) for d in heart_rate["daily"]] == [
+        ("2024-01-29", 65.0),
+        ("2024-01-30", 80.0),
+    ]
+    assert heart_rate["weekly"] == [
+        {"week": "2024-W05", "start_date": "2024-01-29", "value": 72.5, "count": 2},
+    ]
+    assert heart_rate["monthly"] == [
+        {"month": "2024-01", "start_date": "2024-01-01", "value": 72.5, "count": 2},
+    ]
+
+
+def test_rollups_use_the_displayed_daily_value(metrics):
+    body_mass = metrics["body_mass"]
+
+    [day] = body_mass["daily"]
+    assert day["value"] == 116.0673
+    assert body_mass["weekly"][0]["value"] == day["value"]
+    assert body_mass["monthly"][0]["value"] == day["value"]
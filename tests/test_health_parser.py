@@ -0,0 +1,170 @@
+"""Tests for the streaming Apple Health export parser."""
+
+import sys
+import xml.etree.ElementTree as StdET
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from data_processing import health_parser
+from data_processing.health_parser import AppleHealthParser, HealthRecord
+
+STEPS = "HKQuantityTypeIdentifierStepCount"
+SYSTOLIC = "HKQuantityTypeIdentifierBloodPressureSystolic"
+DIASTOLIC = "HKQuantityTypeIdentifierBloodPressureDiastolic"
+SLEEP = "HKCategoryTypeIdentifierSleepAnalysis"
+
+# One of everything the parser has to handle, in document order
+SAMPLE = f"""
+ <Record type="{STEPS}" sourceName="iPhone" unit="count" value="412"
+         startDate="2024-03-01 07:05:09 +0100" endDate="2024-03-01 07:15:09 +0100"
+         sourceVersion="17.4" device="&lt;&lt;HKDevice&gt;&gt;"/>
+ <Record type="{SLEEP}" sourceName="Apple Watch" value="HKCategoryValueSleepAnalysisAsleep"
+         startDate="2024-03-01 01:00:00 +0100" endDate="2024-03-01 06:00:00 +0100"/>
+ <Correlation type="HKCorrelationTypeIdentifierBloodPressure" sourceName="Omron"
+              startDate="2024-03-01 08:00:00 +0100" endDate="2024-03-01 08:00:00 +0100">
+  <Record type="{SYSTOLIC}" sourceName="Omron" unit="mmHg" value="120"
+          startDate="2024-03-01 08:00:00 +0100" endDate="2024-03-01 08:00:00 +0100"/>
+  <Record type="{DIASTOLIC}" sourceName="Omron" unit="mmHg" value="80"
+          startDate="2024-03-01 08:00:00 +0100" endDate="2024-03-01 08:00:00 +0100"/>
+ </Correlation>
+ <Workout workoutActivityType="HKWorkoutActivityTypeRunning" sourceName="Apple Watch"
+          duration="32.5" durationUnit="min" totalDistance="5.1" totalDistanceUnit="km"
+          startDate="2024-03-02 18:00:00 +0100" endDate="2024-03-02 18:32:30 +0100">
+  <WorkoutEvent type="HKWorkoutEventTypePause" date="2024-03-02 18:10:00 +0100"/>
+ </Workout>
+ <Record type="{STEPS}" sourceName="iPhone" unit="count" value="88"
+         startDate="2024-03-02T09:00:00+01:00" endDate="2024-03-02T09:05:00+01:00"/>
+"""
+
+
+@pytest.fixture(params=["lxml", "stdlib"])
+def backend(request, monkeypatch) -> str:
+    """Run the test once with lxml and once with the stdlib ElementTree fallback."""
+    _use_backend(monkeypatch, request.param)
+    return request.param
+
+
+def _use_backend(monkeypatch, name: str) -> None:
+    if name == "lxml":
+        monkeypatch.setattr(health_parser, "ET", pytest.importorskip("lxml.etree"))
+        monkeypatch.setattr(health_parser, "HAS_LXML", True)
+    else:
+        monkeypatch.setattr(health_parser, "ET", StdET)
+        monkeypatch.setattr(health_parser, "HAS_LXML", False)
+
+
+def _write_export(tmp_path: Path, body: str) -> Path:
+    path = tmp_path / "export.zip"
+    xml = f'<?xml version="1.0" encoding="UTF-8"?>\n<HealthData locale="en_US">{body}</HealthData>\n'
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        # Listed first, and must not be mistaken for the export itself
+        zf.writestr("apple_health_export/export_cda.xml", "<ClinicalDocument/>")
+        zf.writestr("apple_health_export/export.xml", xml)
+    return path
+
+
+def _parse(tmp_path: Path, body: str, **kwargs) -> List[HealthRecord]:
+    return AppleHealthParser(_write_export(tmp_path, body), **kwargs).parse()
+
+
+def test_parses_sample_export(tmp_path, backend):
+    records = _parse(tmp_path, SAMPLE)
+
+    assert [r.record_type for r in records] == [
+        STEPS, SYSTOLIC, DIASTOLIC, "Workout:HKWorkoutActivityTypeRunning", STEPS,
+    ]
+    assert records[0] == HealthRecord(
+        record_type=STEPS,
+        source="iPhone",
+        unit="count",
+        value=412.0,
+        start_date=datetime(2024, 3, 1, 7, 5, 9),
+        end_date=datetime(2024, 3, 1, 7, 15, 9),
+        metadata={"sourceVersion": "17.4", "device": "<<HKDevice>>"},
+    )
+    workout = records[3]
+    assert workout.value == 32.5
+    assert workout.unit == "min"
+    assert workout.metadata["total_distance"] == "5.1"
+    # ISO 'T' dates keep their local time and come back naive, like the rest
+    assert records[4].start_date == datetime(2024, 3, 2, 9, 0, 0)
+
+
+def test_backends_produce_same_records(tmp_path, monkeypatch):
+    _use_backend(monkeypatch, "lxml")
+    with_lxml = _parse(tmp_path, SAMPLE)
+    _use_backend(monkeypatch, "stdlib")
+    with_stdlib = _parse(tmp_path, SAMPLE)
+
+    assert with_lxml == with_stdlib
+
+
+def test_records_nested_in_correlation(tmp_path, backend):
+    records = _parse(tmp_path, SAMPLE)
+
+    pressure = {r.record_type: r.value for r in records if r.source == "Omron"}
+    assert pressure == {SYSTOLIC: 120.0, DIASTOLIC: 80.0}
+
+
+def test_exclusions(tmp_path, backend):
+    records = _parse(
+        tmp_path,
+        SAMPLE,
+        exclude_types=[SYSTOLIC, "HKWorkoutActivityTypeRunning"],
+        exclude_sources=["iPhone"],
+    )
+
+    assert [r.record_type for r in records] == [DIASTOLIC]
+
+
+def test_value_attribute_takes_precedence_over_child(tmp_path, backend):
+    body = f"""
+     <Record type="{STEPS}" sourceName="iPhone" value="5" startDate="2024-03-01 07:00:00 +0100">
+      <Value>7</Value>
+     </Record>"""
+
+    [record] = _parse(tmp_path, body)
+
+    assert record.value == 5.0
+
+
+def test_child_elements_used_when_attributes_missing(tmp_path, backend):
+    body = f"""
+     <Record type="{STEPS}" sourceName="iPhone">
+      <Value>
+       7
+      </Value>
+      <StartDate>2024-03-01 07:00:00 +0100</StartDate>
+      <EndDate>2024-03-01 07:30:00 +0100</EndDate>
+      <Note>manual</Note>
+     </Record>
+     <Record type="{STEPS}" sourceName="iPhone" value=" 5 " startDate="2024-03-01 08:00:00 +0100"/>"""
+
+    first, second = _parse(tmp_path, body)
+
+    assert first.value == 7.0
+    assert first.start_date == datetime(2024, 3, 1, 7, 0, 0)
+    assert first.end_date == datetime(2024, 3, 1, 7, 30, 0)
+    assert first.metadata == {"Note": "manual"}
+    assert second.value == 5.0
+    assert second.end_date is None
+
+
+@pytest.mark.parametrize(
+    "value", ["HKCategoryValueSleepAnalysisAsleep", "", "nan", "-nan", "+inf", "-inf"]
+)
+def test_non_numeric_values_are_skipped(tmp_path, backend, value):
+    body = f"""
+     <Record type="{SLEEP}" sourceName="Apple Watch" value="{value}"
+             startDate="2024-03-01 01:00:00 +0100"/>
+     <Record type="{STEPS}" sourceName="iPhone" value="1" startDate="2024-03-01 07:00:00 +0100"/>"""
+
+    records = _parse(tmp_path, body)
+
+    assert [r.record_type for r in records] == [STEPS]
@@ -0,0 +1,52 @@
+"""Tests for the orjson / stdlib JSON codec."""
+
+import sys
+from datetime import date, datetime
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils import json_codec
+
+PAYLOAD = {
+    "float": np.float64(1.5),
+    "float32": np.float32(0.25),
+    "int": np.int64(3),
+    "array": np.array([1.5, np.nan]),
+    "nan": float("nan"),
+    "inf": float("-inf"),
+    "datetime": datetime(2024, 1, 2, 3, 4, 5),
+    "date": date(2024, 1, 2),
+    "tuple": (1, "Café"),
+    "nested": [{"count": np.int32(2), "value": None}],
+}
+
+EXPECTED = {
+    "float": 1.5,
+    "float32": 0.25,
+    "int": 3,
+    "array": [1.5, None],
+    "nan": None,
+    "inf": None,
+    "datetime": "2024-01-02 03:04:05",
+    "date": "2024-01-02",
+    "tuple": [1, "Café"],
+    "nested": [{"count": 2, "value": None}],
+}
+
+
+def test_stdlib_fallback_output(monkeypatch):
+    monkeypatch.setattr(json_codec, "orjson", None)
+
+    assert json_codec.loads(json_codec.dumps(PAYLOAD)) == EXPECTED
+
+
+def test_backends_write_identical_bytes(monkeypatch):
+    pytest.importorskip("orjson")
+    with_orjson = json_codec.dumps(PAYLOAD)
+    monkeypatch.setattr(json_codec, "orjson", None)
+
+    assert json_codec.dumps(PAYLOAD) == with_orjson
@@ -0,0 +1,87 @@
+"""Tests for the Parquet cache of parsed health records."""
+
+import os
+import sys
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from data_processing.health_parser import AppleHealthParser, HealthRecord
+from data_processing.record_cache import RecordCache
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def export_zip(tmp_path: Path) -> Path:
+    path = tmp_path / "export.zip"
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("apple_health_export/export.xml", "<HealthData/>")
+    return path
+
+
+@pytest.fixture
+def records() -> List[HealthRecord]:
+    return [
+        HealthRecord(
+            record_type="HKQuantityTypeIdentifierStepCount",
+            source="iPhone",
+            unit=None,
+            value=412.0,
+            start_date=datetime(2024, 3, 1, 7, 5, 9),
+            end_date=None,
+            metadata={},
+        ),
+        HealthRecord(
+            record_type="Workout:HKWorkoutActivityTypeRunning",
+            source="Apple Watch",
+            unit="min",
+            value=32.5,
+            start_date=datetime(2024, 3, 2, 18, 0, 0),
+            end_date=datetime(2024, 3, 2, 18, 32, 30),
+            metadata={
+                "workout_type": "HKWorkoutActivityTypeRunning",
+                "duration": 32.5,
+                "total_distance": "5.1",
+                "total_energy_burned": None,
+            },
+        ),
+    ]
+
+
+def test_round_trip_preserves_records(tmp_path, export_zip, records):
+    parser = AppleHealthParser(export_zip)
+    cache = RecordCache(tmp_path / "cache")
+
+    cache.save(parser, records)
+    loaded = cache.load(parser)
+
+    assert loaded == records
+    assert loaded[0].unit is None
+    assert loaded[0].end_date is None
+    assert loaded[1].metadata == records[1].metadata
+
+
+def test_miss_after_exclusions_change(tmp_path, export_zip, records):
+    cache = RecordCache(tmp_path / "cache")
+    cache.save(AppleHealthParser(export_zip), records)
+
+    excluding = AppleHealthParser(export_zip, exclude_sources=["iPhone"])
+
+    assert cache.load(excluding) is None
+
+
+def test_miss_after_export_mtime_change(tmp_path, export_zip, records):
+    parser = AppleHealthParser(export_zip)
+    cache = RecordCache(tmp_path / "cache")
+    cache.save(parser, records)
+
+    stat = export_zip.stat()
+    os.utime(export_zip, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert cache.load(parser) is None